@@ -0,0 +1,170 @@
+"""Error and speed of the approximate distance mode against the exact router."""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.point import Point
+from src.rectangle import Rectangle
+from src.clearance import ClearanceProfile, DEFAULT_PROFILE
+from src.map_loader import load_map
+from src.pathfinding import find_shortest_path
+from src.routing import path_distance
+from exporter import calculate_all_paths
+
+
+def dense_layout(
+    width: float,
+    height: float,
+    num_points: int,
+    seed: int = 1
+) -> tuple[list[Point], list[Rectangle], Rectangle]:
+    """
+    Synthetic hall packed with 1.2 x 4 m racks in 2.8 m aisles.
+
+    Pick points sit 0.3 m off the right face of random racks, so every one of
+    them is snapped out before routing.
+    """
+    rng = random.Random(seed)
+    boundary = Rectangle(corners=[Point(0, 0), Point(width, height)], label="Boundary")
+    obstacles = []
+    x = 2.0
+    while x + 1.2 < width - 2:
+        y = 2.0
+        while y + 4 < height - 2:
+            obstacles.append(Rectangle(corners=[Point(x, y), Point(x + 1.2, y + 4)], label=f"R{len(obstacles)}"))
+            y += 5.5
+        x += 4.0
+    points = []
+    for k in range(num_points):
+        rack = rng.choice(obstacles)
+        points.append(Point(rack.max_x + 0.3, rng.uniform(rack.min_y, rack.max_y), f"P{k}"))
+    return points, obstacles, boundary
+
+
+def check_router(
+    points: list[Point],
+    obstacles: list[Rectangle],
+    boundary: Rectangle,
+    exact: dict,
+    samples: int,
+    profile: ClearanceProfile = DEFAULT_PROFILE,
+    seed: int = 1
+) -> tuple[int, float]:
+    """
+    Recompute sampled exact pairs with find_shortest_path.
+
+    calculate_all_paths routes through the shared RoutingEngine, this checks
+    it against the standalone router. Returns the pairs checked and the
+    largest difference in metres, inf when only one of them finds a path.
+    """
+    pairs = random.Random(seed).sample(sorted(exact), min(samples, len(exact)))
+    worst = 0.0
+    for i, j in pairs:
+        dist = path_distance(find_shortest_path(points[i], points[j], obstacles, boundary, profile))
+        if (dist < 0) != (exact[(i, j)][1] < 0):
+            worst = float('inf')
+        elif dist >= 0:
+            worst = max(worst, abs(dist - exact[(i, j)][1]))
+    return len(pairs), worst
+
+
+def compare(
+    points: list[Point],
+    obstacles: list[Rectangle],
+    boundary: Rectangle,
+    resolution: float,
+    executor: ThreadPoolExecutor,
+    profile: ClearanceProfile = DEFAULT_PROFILE,
+    check: int = 0
+) -> dict:
+    """
+    Relative error of every approximate distance and the time each method took.
+
+    `check` exact pairs are also recomputed with find_shortest_path.
+    """
+    start = time.perf_counter()
+    exact = calculate_all_paths(points, obstacles, boundary, executor, profile=profile)
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approx = calculate_all_paths(
+        points, obstacles, boundary, executor, profile=profile, method="approximate", resolution=resolution
+    )
+    approx_time = time.perf_counter() - start
+
+    errors = []
+    mismatched = 0
+    for pair, (_, dist) in exact.items():
+        approx_dist = approx[pair][1]
+        if (dist < 0) != (approx_dist < 0):
+            mismatched += 1
+        elif dist > 0:
+            errors.append((approx_dist - dist) / dist)
+
+    checked, router_diff = check_router(points, obstacles, boundary, exact, check, profile)
+
+    errors.sort(key=abs)
+    return {
+        "pairs": len(exact),
+        "exact_time": exact_time,
+        "approx_time": approx_time,
+        "mean": sum(abs(e) for e in errors) / len(errors) if errors else 0.0,
+        "p95": abs(errors[int(0.95 * (len(errors) - 1))]) if errors else 0.0,
+        "min": min(errors, default=0.0),
+        "max": max(errors, default=0.0),
+        "mismatched": mismatched,
+        "compared": len(errors),
+        "checked": checked,
+        "router_diff": router_diff,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", nargs="*", type=Path, help="map files, default json_files/*.json")
+    parser.add_argument("--resolution", type=float, default=0.1, help="grid cell size in metres")
+    parser.add_argument("--clearance", type=float, default=DEFAULT_PROFILE.clearance, help="rack inflation in metres")
+    parser.add_argument("--limit", type=int, default=None, help="only use the first N points of each map")
+    parser.add_argument(
+        "--check", type=int, default=20,
+        help="exact pairs per map recomputed with find_shortest_path, 0 to skip"
+    )
+    parser.add_argument(
+        "--dense", type=float, nargs=2, metavar=("WIDTH", "HEIGHT"),
+        help="use a synthetic hall of that size densely packed with racks instead of map files"
+    )
+    parser.add_argument("--points", type=int, default=150, help="pick points of the --dense layout")
+    args = parser.parse_args()
+
+    if args.dense:
+        width, height = args.dense
+        layouts = [(f"dense {width:g}x{height:g}", dense_layout(width, height, args.points))]
+    else:
+        files = args.files or sorted(Path("json_files").glob("*.json"))
+        layouts = [(path.name, load_map(path)) for path in files]
+
+    profile = ClearanceProfile("report", args.clearance)
+    failed = False
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for name, (points, obstacles, boundary) in layouts:
+            points = points[:args.limit]
+            r = compare(points, obstacles, boundary, args.resolution, executor, profile, args.check)
+            print(
+                f"{name}: {len(obstacles)} racks, {r['compared']}/{r['pairs']} pairs, "
+                f"exact {r['exact_time']:.2f}s, approximate {r['approx_time']:.2f}s, "
+                f"error mean {r['mean']:.2%} p95 {r['p95']:.2%} "
+                f"range {r['min']:+.2%}..{r['max']:+.2%}, "
+                f"reachability mismatches {r['mismatched']}, "
+                f"find_shortest_path on {r['checked']} pairs off by {r['router_diff']:.2g} m"
+            )
+            failed |= r['router_diff'] > 1e-6
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
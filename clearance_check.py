@@ -0,0 +1,71 @@
+"""Check that no distance gets shorter when the clearance grows."""
+
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.clearance import ClearanceProfile
+from src.routing import RoutingEngine
+from src.map_loader import load_map
+from config import CLEARANCE_PROFILES
+from exporter import calculate_profile_paths
+
+
+def find_violations(
+    points: list,
+    engine: RoutingEngine,
+    executor: ThreadPoolExecutor
+) -> list[tuple[str, str, tuple[int, int], float, float]]:
+    """
+    Pairs whose distance drops from one profile to the next wider one.
+
+    Profiles are compared in order of clearance, a missing path counts as
+    infinitely long.
+    """
+    results = calculate_profile_paths(points, engine, executor)
+    names = sorted(engine.profile_names, key=lambda name: engine.profiles[name].clearance)
+
+    def length(dist: float) -> float:
+        return dist if dist >= 0 else float('inf')
+
+    violations = []
+    for narrow, wide in zip(names, names[1:]):
+        for pair, (_, dist) in results[narrow].items():
+            wide_dist = results[wide][pair][1]
+            if length(wide_dist) < length(dist) - 1e-9:
+                violations.append((narrow, wide, pair, dist, wide_dist))
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", nargs="*", type=Path, help="map files, default json_files/*.json")
+    parser.add_argument(
+        "--clearance", type=float, action="append",
+        help="clearance to compare, repeatable, default the profiles from config.py"
+    )
+    args = parser.parse_args()
+
+    if args.clearance:
+        profiles = [ClearanceProfile(f"clearance_{c}", c) for c in sorted(set(args.clearance))]
+    else:
+        profiles = [ClearanceProfile.from_dict(p) for p in CLEARANCE_PROFILES]
+
+    files = args.files or sorted(Path("json_files").glob("*.json"))
+    failed = False
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for path in files:
+            points, obstacles, boundary = load_map(path)
+            engine = RoutingEngine(obstacles, boundary, profiles)
+            violations = find_violations(points, engine, executor)
+            print(f"{path.name}: {len(violations)} pairs shorter with a wider clearance")
+            for narrow, wide, (i, j), dist, wide_dist in violations[:5]:
+                print(f"  {points[i].label} -> {points[j].label}: {narrow} {dist:.3f}, {wide} {wide_dist:.3f}")
+            failed |= bool(violations)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
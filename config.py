@@ -11,4 +11,14 @@ POINT_COLOUR = "orange"
 
 _colours_path = Path(__file__).parent / "colors.json"
 with open(_colours_path) as _f:
-    NICE_COLOURS: list[str] = json.load(_f)["obstacle_colours"]
\ No newline at end of file
+    NICE_COLOURS: list[str] = json.load(_f)["obstacle_colours"]
+
+# clearance profiles per vehicle class, "clearance" is how far racks are inflated
+# (about half the vehicle width), the narrowest aisles on the shipped maps are 0.92 m
+CLEARANCE_PROFILES: list[dict] = [
+    {"name": "pallet_jack", "clearance": 0.4},
+    {"name": "reach_truck", "clearance": 0.8},
+]
+
+# consolidated distance database, every export appends its area
+DISTANCE_DB = Path(__file__).parent / "reports" / "distances.db"
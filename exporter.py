@@ -1,3 +1,4 @@
+import math
 import pickle
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
@@ -6,7 +7,9 @@ from typing import Callable, Optional
 
 from src.point import Point
 from src.rectangle import Rectangle
-from src.pathfinding import find_shortest_path
+from src.clearance import ClearanceProfile, DEFAULT_PROFILE
+from src.routing import RoutingEngine, path_distance
+from src.distance_db import DistanceStore, DATABASE_NAME
 
 
 def calculate_all_paths(
@@ -15,20 +18,74 @@ def calculate_all_paths(
     boundary: Rectangle,
     executor: ThreadPoolExecutor,
     on_progress: Optional[Callable[[int, int], None]] = None,
+    profile: ClearanceProfile = DEFAULT_PROFILE,
+    method: str = "exact",
+    resolution: float = 0.1,
+    batch_size: Optional[int] = None,
 ) -> dict[tuple[int, int], tuple[Optional[list[Point]], float]]:
+    """
+    Calculate all point-to-point paths.
+
+    `method` is "exact" for visibility graph routes, or "approximate" for
+    distances read from rasterized distance fields with `resolution` metre
+    cells, `batch_size` pick points at a time (by default as many as fit the
+    raster memory budget). Approximate results carry no waypoints and need numpy.
+    """
+    if method == "approximate":
+        return calculate_approximate_paths(points, obstacles, boundary, on_progress, profile, resolution, batch_size)
+    if method != "exact":
+        raise ValueError(f"Unknown path method: {method}")
+
+    engine = RoutingEngine(obstacles, boundary, [profile])
+    return calculate_profile_paths(points, engine, executor, on_progress)[profile.name]
+
+
+def calculate_approximate_paths(
+    points: list[Point],
+    obstacles: list[Rectangle],
+    boundary: Rectangle,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    profile: ClearanceProfile = DEFAULT_PROFILE,
+    resolution: float = 0.1,
+    batch_size: Optional[int] = None,
+) -> dict[tuple[int, int], tuple[Optional[list[Point]], float]]:
+    """All point-to-point distances from rasterized distance fields, without waypoints."""
+    # numpy is only needed for this mode, keep the GUI on the standard library
+    from src.raster import RasterEngine
+
+    engine = RasterEngine(obstacles, boundary, resolution, profile)
+    matrix = engine.distance_matrix(points, batch_size, on_progress)
+
+    results: dict[tuple[int, int], tuple[Optional[list[Point]], float]] = {}
+    for i in range(len(points)):
+        for j in range(i + 1, len(points)):
+            dist = float(matrix[i, j])
+            results[(i, j)] = (None, dist if math.isfinite(dist) else -1.0)
+    return results
+
+
+def calculate_profile_paths(
+    points: list[Point],
+    engine: RoutingEngine,
+    executor: ThreadPoolExecutor,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> dict[str, dict[tuple[int, int], tuple[Optional[list[Point]], float]]]:
+    """Calculate all point-to-point paths once per clearance profile of the engine."""
     futures = {}
-    for i, p1 in enumerate(points):
-        for j, p2 in enumerate(points):
-            if i >= j:
-                continue
-            futures[(i, j)] = executor.submit(find_shortest_path, p1, p2, obstacles, boundary)
+    for profile in engine.profile_names:
+        for i, p1 in enumerate(points):
+            for j, p2 in enumerate(points):
+                if i >= j:
+                    continue
+                futures[(profile, i, j)] = executor.submit(engine.shortest_path, p1, p2, profile)
 
-    results = {}
+    results: dict[str, dict[tuple[int, int], tuple[Optional[list[Point]], float]]] = {
+        profile: {} for profile in engine.profile_names
+    }
     total = len(futures)
-    for idx, (key, future) in enumerate(futures.items()):
+    for idx, ((profile, i, j), future) in enumerate(futures.items()):
         path = future.result()
-        dist = sum(path[k].distance_to(path[k + 1]) for k in range(len(path) - 1)) if path else -1.0
-        results[key] = (path, dist)
+        results[profile][(i, j)] = (path, path_distance(path))
         if on_progress:
             on_progress(idx + 1, total)
 
@@ -39,17 +96,31 @@ def export_paths(
     results: dict[tuple[int, int], tuple[Optional[list[Point]], float]],
     points: list[Point],
     output_dir: Path,
+    profile: Optional[str] = None,
+    timestamp: Optional[str] = None,
+    area: Optional[str] = None,
+    database: Optional[Path] = None,
 ) -> tuple[Path, Path]:
+    """
+    Write the results as .txt and .pkl reports.
+
+    The pickle holds the distances dict followed by a second object with the
+    area and profile, so DistanceStore.import_pickle can place it. With an
+    area the results are also appended to the distance database, by default
+    distances.db in output_dir, together with the .pkl so it is not imported
+    again.
+    """
     output_dir.mkdir(exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    txt_path = output_dir / f"paths_{timestamp}.txt"
-    pkl_path = output_dir / f"paths_{timestamp}.pkl"
+    timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+    stem = "_".join(["paths"] + [part for part in (area, profile) if part] + [timestamp])
+    txt_path = output_dir / f"{stem}.txt"
+    pkl_path = output_dir / f"{stem}.pkl"
 
     with open(txt_path, 'w') as f:
         for (i, j), (path, dist) in sorted(results.items()):
             label1 = points[i].label or f"Point {i}"
             label2 = points[j].label or f"Point {j}"
-            if path and dist >= 0:
+            if dist >= 0:
                 f.write(f"{label1} -> {label2}: {dist:.2f}\n")
             else:
                 f.write(f"{label1} -> {label2}: NO PATH\n")
@@ -63,5 +134,26 @@ def export_paths(
     }
     with open(pkl_path, 'wb') as f:
         pickle.dump(pickle_data, f)
+        # readers that load once still get just the distances
+        pickle.dump({"area": area, "profile": profile}, f)
 
-    return txt_path, pkl_path
\ No newline at end of file
+    if area:
+        with DistanceStore(database or output_dir / DATABASE_NAME) as store:
+            store.add_area(area, points, results, profile or DEFAULT_PROFILE.name, pkl_path)
+
+    return txt_path, pkl_path
+
+
+def export_profile_paths(
+    profile_results: dict[str, dict[tuple[int, int], tuple[Optional[list[Point]], float]]],
+    points: list[Point],
+    output_dir: Path,
+    area: Optional[str] = None,
+    database: Optional[Path] = None,
+) -> dict[str, tuple[Path, Path]]:
+    """Export one distance matrix per clearance profile, sharing a timestamp."""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return {
+        profile: export_paths(results, points, output_dir, profile, timestamp, area, database)
+        for profile, results in profile_results.items()
+    }
\ No newline at end of file
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ClearanceProfile:
+    """How much room a vehicle class needs around racks.
+
+    `clearance` is how far the racks are inflated when placing corner
+    waypoints. The default keeps the narrowest aisles of the shipped maps
+    open.
+    """
+    name: str
+    clearance: float = 0.4
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ClearanceProfile':
+        return cls(
+            name=data["name"],
+            clearance=data.get("clearance", 0.4),
+        )
+
+
+DEFAULT_PROFILE = ClearanceProfile("default")
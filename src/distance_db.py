@@ -0,0 +1,280 @@
+"""Persistent, indexed store of point-to-point distances across warehouse areas."""
+
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .point import Point
+from .clearance import DEFAULT_PROFILE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    area TEXT NOT NULL,
+    label TEXT NOT NULL,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    is_key INTEGER NOT NULL,
+    PRIMARY KEY (area, label)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS distances (
+    area TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    from_label TEXT NOT NULL,
+    to_label TEXT NOT NULL,
+    distance REAL NOT NULL,
+    PRIMARY KEY (area, profile, from_label, to_label)
+) WITHOUT ROWID;
+
+-- each pair is stored once, this covers the lookups by to_label
+CREATE INDEX IF NOT EXISTS distances_reverse
+    ON distances (area, profile, to_label, from_label, distance);
+
+-- key points (WP_*) across all areas without touching the table
+CREATE INDEX IF NOT EXISTS points_key
+    ON points (is_key, area, label, x, y);
+
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+# distance of a pair stored in either order
+_PAIR_DISTANCE = """
+SELECT distance FROM distances
+WHERE area = ? AND profile = ? AND from_label = ? AND to_label = ?
+UNION ALL
+SELECT distance FROM distances
+WHERE area = ? AND profile = ? AND to_label = ? AND from_label = ?
+LIMIT 1
+"""
+
+
+# file name of the database next to the exported reports
+DATABASE_NAME = "distances.db"
+
+
+def area_from_filename(path: Union[str, Path]) -> str:
+    """Area id from a map or report file name, e.g. mapping_M.json or m_mapping.pkl -> M."""
+    return Path(path).stem.replace('mapping', '').replace('_', '').upper()
+
+
+def is_key_point(label: str) -> bool:
+    """Key points are the area waypoints (WP_*) linking areas together."""
+    return 'WP' in label
+
+
+class DistanceStore:
+    """
+    SQLite database of pick points and distances, keyed by area and labels.
+
+    Each area export is written in one transaction and replaces only the
+    points of that area and its distances for that profile, so consolidating
+    areas never rebuilds the rest.
+    A pair is stored once in export order; lookups accept either order.
+    Distances follow the export convention, -1.0 means no path.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'DistanceStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_area(
+        self,
+        area: str,
+        points: list[Point],
+        results: dict[tuple[int, int], tuple[Optional[list[Point]], float]],
+        profile: str = DEFAULT_PROFILE.name,
+        source: Optional[Union[str, Path]] = None
+    ):
+        """
+        Store the points and all-pairs results of one area export.
+
+        `source` is the report file written for this export; it is recorded
+        like an imported file, so import_pickle skips it until it changes.
+        """
+        labels = [p.label or f"Point {i}" for i, p in enumerate(points)]
+        with self.conn:
+            self.conn.execute("DELETE FROM points WHERE area = ?", (area,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?)",
+                ((area, label, p.x, p.y, is_key_point(label)) for label, p in zip(labels, points))
+            )
+            self.conn.execute("DELETE FROM distances WHERE area = ? AND profile = ?", (area, profile))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO distances VALUES (?, ?, ?, ?, ?)",
+                ((area, profile, labels[i], labels[j], dist) for (i, j), (_, dist) in results.items())
+            )
+            if source is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?)",
+                    (str(Path(source).resolve()), os.path.getmtime(source))
+                )
+
+    def import_pickle(
+        self,
+        path: Union[str, Path],
+        area: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> bool:
+        """
+        Add an exported .pkl report, skipped when it was imported unchanged before.
+
+        Area and profile come from the metadata the exporter writes after the
+        distances; older reports without it are named after their area
+        (m_mapping.pkl) and count as the default profile. Point coordinates
+        come from the path end points, reports exported without waypoints
+        keep the stored points and only replace distances. Returns True if
+        the file was read.
+        """
+        path = Path(path)
+        mtime = os.path.getmtime(path)
+        row = self.conn.execute("SELECT mtime FROM sources WHERE path = ?", (str(path.resolve()),)).fetchone()
+        if row and row[0] == mtime:
+            return False
+
+        with open(path, 'rb') as f:
+            report = pickle.load(f)
+            try:
+                meta = pickle.load(f)
+            except EOFError:
+                meta = None
+
+        if meta is None:
+            area = area or area_from_filename(path)
+        else:
+            area = area or meta.get("area")
+            if not area:
+                raise ValueError(f"{path.name} was exported without an area, pass one explicitly")
+            profile = profile or meta.get("profile")
+        profile = profile or DEFAULT_PROFILE.name
+
+        points: dict[str, tuple[float, float]] = {}
+        for (label1, label2), entry in report.items():
+            waypoints = entry.get("waypoints")
+            if waypoints:
+                points.setdefault(label1, tuple(waypoints[0]))
+                points.setdefault(label2, tuple(waypoints[-1]))
+
+        with self.conn:
+            if points:
+                self.conn.execute("DELETE FROM points WHERE area = ?", (area,))
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?)",
+                    ((area, label, x, y, is_key_point(label)) for label, (x, y) in points.items())
+                )
+            self.conn.execute("DELETE FROM distances WHERE area = ? AND profile = ?", (area, profile))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO distances VALUES (?, ?, ?, ?, ?)",
+                ((area, profile, l1, l2, entry["distance"]) for (l1, l2), entry in report.items())
+            )
+            self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (str(path.resolve()), mtime))
+        return True
+
+    def areas(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT area FROM points ORDER BY area")]
+
+    def profiles(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT profile FROM distances ORDER BY profile")]
+
+    def point(self, area: str, label: str) -> Optional[Point]:
+        row = self.conn.execute(
+            "SELECT x, y FROM points WHERE area = ? AND label = ?", (area, label)
+        ).fetchone()
+        return Point(row[0], row[1], label) if row else None
+
+    def points(self, area: Optional[str] = None, key_only: bool = False) -> list[tuple[str, Point, bool]]:
+        """(area, point, is_key) rows, optionally for one area or only key points."""
+        query = "SELECT area, label, x, y, is_key FROM points WHERE 1"
+        params: list = []
+        if key_only:
+            query += " AND is_key = 1"
+        if area is not None:
+            query += " AND area = ?"
+            params.append(area)
+        query += " ORDER BY area, label"
+        return [
+            (a, Point(x, y, label), bool(key))
+            for a, label, x, y, key in self.conn.execute(query, params)
+        ]
+
+    def distance(
+        self,
+        area: str,
+        from_label: str,
+        to_label: str,
+        profile: str = DEFAULT_PROFILE.name
+    ) -> Optional[float]:
+        """Distance between two points of an area in either order, None if not stored."""
+        row = self.conn.execute(
+            _PAIR_DISTANCE,
+            (area, profile, from_label, to_label, area, profile, from_label, to_label)
+        ).fetchone()
+        return row[0] if row else None
+
+    def distances_from(self, area: str, label: str, profile: str = DEFAULT_PROFILE.name) -> dict[str, float]:
+        """Distances from one point to every other point of its area."""
+        rows = self.conn.execute(
+            "SELECT to_label, distance FROM distances WHERE area = ? AND profile = ? AND from_label = ? "
+            "UNION ALL "
+            "SELECT from_label, distance FROM distances WHERE area = ? AND profile = ? AND to_label = ?",
+            (area, profile, label, area, profile, label)
+        )
+        return dict(rows)
+
+    def lookup(
+        self,
+        pairs: Iterable[tuple[str, str, str]],
+        profile: str = DEFAULT_PROFILE.name
+    ) -> list[Optional[float]]:
+        """
+        Distances for many (area, from_label, to_label) pairs in one join.
+
+        The pairs go to a temporary table joined against both orders, results
+        keep the input order with None for pairs that are not stored.
+        """
+        with self.conn:
+            self.conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS lookup_pairs "
+                "(seq INTEGER PRIMARY KEY, area TEXT, from_label TEXT, to_label TEXT)"
+            )
+            self.conn.execute("DELETE FROM lookup_pairs")
+            self.conn.executemany(
+                "INSERT INTO lookup_pairs (area, from_label, to_label) VALUES (?, ?, ?)", pairs
+            )
+        rows = self.conn.execute(
+            """
+            SELECT COALESCE(f.distance, r.distance)
+            FROM lookup_pairs q
+            LEFT JOIN distances f
+                ON f.area = q.area AND f.profile = ? AND f.from_label = q.from_label AND f.to_label = q.to_label
+            LEFT JOIN distances r
+                ON r.area = q.area AND r.profile = ? AND r.to_label = q.from_label AND r.from_label = q.to_label
+            ORDER BY q.seq
+            """,
+            (profile, profile)
+        )
+        return [row[0] for row in rows]
+
+    def all_distances(self, profile: str = DEFAULT_PROFILE.name) -> list[tuple[str, str, str, float]]:
+        """Every stored (area, from_label, to_label, distance) of a profile."""
+        return self.conn.execute(
+            "SELECT area, from_label, to_label, distance FROM distances WHERE profile = ? "
+            "ORDER BY area, from_label, to_label",
+            (profile,)
+        ).fetchall()
@@ -3,11 +3,14 @@ from .rectangle import Rectangle
 
 
 def segments_intersect(p1: Point, p2: Point, p3: Point, p4: Point) -> bool:
-    """Check if line segment p1-p2 intersects with segment p3-p4."""
-    def ccw(a: Point, b: Point, c: Point) -> bool:
-        return (c.y - a.y) * (b.x - a.x) > (b.y - a.y) * (c.x - a.x)
+    """Check if line segment p1-p2 crosses segment p3-p4, touching at an end point does not count."""
+    def orient(a: Point, b: Point, c: Point) -> float:
+        return (c.y - a.y) * (b.x - a.x) - (b.y - a.y) * (c.x - a.x)
 
-    return ccw(p1, p3, p4) != ccw(p2, p3, p4) and ccw(p1, p2, p3) != ccw(p1, p2, p4)
+    return (
+        orient(p1, p3, p4) * orient(p2, p3, p4) < 0 and
+        orient(p1, p2, p3) * orient(p1, p2, p4) < 0
+    )
 
 
 def line_intersects_rect(p1: Point, p2: Point, rect: Rectangle) -> bool:
@@ -0,0 +1,165 @@
+"""Compact CSR graph and Dijkstra running directly on it."""
+
+import math
+import threading
+from array import array
+from heapq import heappush, heappop
+from typing import Optional
+
+
+class CSRGraph:
+    """
+    Undirected weighted graph in compressed sparse row layout.
+
+    Neighbours of node u are `neighbours[offsets[u]:offsets[u + 1]]` with the
+    matching `weights`, so an edge costs one int and one float instead of a
+    Python tuple.
+    """
+
+    def __init__(self, offsets: array, neighbours: array, weights: array):
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self.weights = weights
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.neighbours) // 2
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, sources: array, targets: array, weights: array) -> 'CSRGraph':
+        """Build from parallel edge arrays, each edge stored in both directions."""
+        degree = array('q', bytes(8 * (num_nodes + 1)))
+        for u in sources:
+            degree[u + 1] += 1
+        for v in targets:
+            degree[v + 1] += 1
+
+        offsets = degree
+        for i in range(num_nodes):
+            offsets[i + 1] += offsets[i]
+
+        size = offsets[num_nodes]
+        neighbours = array('q', bytes(8 * size))
+        csr_weights = array('d', bytes(8 * size))
+        fill = array('q', offsets[:num_nodes])
+        for u, v, w in zip(sources, targets, weights):
+            k = fill[u]
+            neighbours[k] = v
+            csr_weights[k] = w
+            fill[u] = k + 1
+            k = fill[v]
+            neighbours[k] = u
+            csr_weights[k] = w
+            fill[v] = k + 1
+
+        return cls(offsets, neighbours, csr_weights)
+
+
+class SearchBuffers:
+    """Distance and predecessor buffers reused across searches."""
+
+    def __init__(self, size: int = 0):
+        self.dist = array('d', [math.inf]) * size
+        self.prev = array('q', [-1]) * size
+        self.touched: list[int] = []
+        self.queue: list[tuple[float, int]] = []
+
+    def prepare(self, size: int):
+        """Grow the buffers to hold at least `size` nodes."""
+        missing = size - len(self.dist)
+        if missing > 0:
+            self.dist.extend(array('d', [math.inf]) * missing)
+            self.prev.extend(array('q', [-1]) * missing)
+
+    def reset(self):
+        """Restore only the entries the last search wrote to."""
+        dist, prev = self.dist, self.prev
+        for v in self.touched:
+            dist[v] = math.inf
+            prev[v] = -1
+        self.touched.clear()
+        self.queue.clear()
+
+
+_local = threading.local()
+
+
+def search_buffers() -> SearchBuffers:
+    """Buffers of the calling thread, so concurrent searches never share state."""
+    buffers = getattr(_local, "buffers", None)
+    if buffers is None:
+        buffers = _local.buffers = SearchBuffers()
+    return buffers
+
+
+def dijkstra(
+    graph: CSRGraph,
+    sources: dict[int, float],
+    targets: dict[int, float],
+    buffers: Optional[SearchBuffers] = None
+) -> tuple[float, list[int]]:
+    """
+    Shortest route from a virtual source to a virtual target.
+
+    `sources` seeds nodes with their initial distance, `targets` gives the
+    remaining cost from a node to the target. Returns the total distance and
+    the nodes visited in order, or (inf, []) when the target is unreachable.
+    """
+    if buffers is None:
+        buffers = search_buffers()
+    buffers.prepare(graph.num_nodes)
+
+    # reset even when the search fails, the buffers outlive it on this thread
+    try:
+        dist, prev, touched, pq = buffers.dist, buffers.prev, buffers.touched, buffers.queue
+        offsets, neighbours, weights = graph.offsets, graph.neighbours, graph.weights
+
+        for v, d in sources.items():
+            if d < dist[v]:
+                if dist[v] == math.inf:
+                    touched.append(v)
+                dist[v] = d
+                prev[v] = -1
+                heappush(pq, (d, v))
+
+        best = math.inf
+        best_node = -1
+
+        while pq:
+            d, u = heappop(pq)
+
+            if d > dist[u]:
+                continue
+
+            if d >= best:
+                break
+
+            remaining = targets.get(u)
+            if remaining is not None and d + remaining < best:
+                best = d + remaining
+                best_node = u
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = neighbours[k]
+                nd = d + weights[k]
+                if nd < dist[v]:
+                    if dist[v] == math.inf:
+                        touched.append(v)
+                    dist[v] = nd
+                    prev[v] = u
+                    heappush(pq, (nd, v))
+
+        nodes: list[int] = []
+        node = best_node
+        while node >= 0:
+            nodes.append(node)
+            node = prev[node]
+        nodes.reverse()
+    finally:
+        buffers.reset()
+
+    return best, nodes
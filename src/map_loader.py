@@ -0,0 +1,18 @@
+"""Reading map files as saved by the visualizer."""
+
+import json
+from pathlib import Path
+from typing import Union
+
+from .point import Point
+from .rectangle import Rectangle
+
+
+def load_map(path: Union[str, Path]) -> tuple[list[Point], list[Rectangle], Rectangle]:
+    """Pick points, racks and boundary of a map .json file."""
+    with open(path) as f:
+        data = json.load(f)
+    boundary = Rectangle(corners=[Point.from_dict(c) for c in data["corners"]], label="Boundary")
+    obstacles = [Rectangle.from_dict(sq) for sq in data.get("squares", [])]
+    points = [Point.from_dict(p) for p in data.get("points", [])]
+    return points, obstacles, boundary
@@ -1,11 +1,17 @@
 """Pathfinding algorithms for obstacle avoidance."""
 
-from heapq import heappush, heappop
+import math
+from array import array
 from typing import Optional
 
 from .point import Point
 from .rectangle import Rectangle
+from .clearance import ClearanceProfile, DEFAULT_PROFILE
 from .geo_helpers import line_intersects_rect
+from .graph import CSRGraph, dijkstra
+
+# (axis, coordinate, outward side) of a rack face, axis 0 is x and 1 is y
+RackFace = tuple[int, float, int]
 
 
 def has_line_of_sight(p1: Point, p2: Point, obstacles: list[Rectangle]) -> bool:
@@ -27,75 +33,100 @@ def is_valid_waypoint(p: Point, obstacles: list[Rectangle], boundary: Rectangle)
     return True
 
 
+def nearest_rack_face(p: Point, obstacles: list[Rectangle]) -> Optional[RackFace]:
+    """
+    Face of the nearest rack that p is furthest outside of.
+
+    Racks are inflated into squares, so pushing p out through this face is
+    the shortest move for any clearance; the face can be found once per
+    point and shared by every clearance profile.
+    """
+    best: Optional[RackFace] = None
+    best_gap = math.inf
+    for obs in obstacles:
+        gap, face = max(
+            (obs.min_x - p.x, (0, obs.min_x, -1)),
+            (p.x - obs.max_x, (0, obs.max_x, 1)),
+            (obs.min_y - p.y, (1, obs.min_y, -1)),
+            (p.y - obs.max_y, (1, obs.max_y, 1)),
+            key=lambda g: g[0]
+        )
+        if gap < best_gap:
+            best_gap, best = gap, face
+    return best
+
+
+def snap_to_clearance(p: Point, face: Optional[RackFace], clearance: float) -> Point:
+    """Move p out through the rack face until it is `clearance` away from it."""
+    if face is None:
+        return p
+    axis, coord, side = face
+    if ((p.x, p.y)[axis] - coord) * side >= clearance:
+        return p
+    target = coord + side * clearance
+    return Point(target, p.y, p.label) if axis == 0 else Point(p.x, target, p.label)
+
+
+def add_access_legs(start: Point, route: list[Point], end: Point) -> list[Point]:
+    """Route between snapped points extended back to the original pick points."""
+    return ([start] if route[0] != start else []) + route + ([end] if route[-1] != end else [])
+
+
 def find_shortest_path(
     start: Point,
     end: Point,
     obstacles: list[Rectangle],
-    boundary: Rectangle
+    boundary: Rectangle,
+    profile: ClearanceProfile = DEFAULT_PROFILE
 ) -> Optional[list[Point]]:
     """
     Find shortest path from start to end avoiding obstacles.
     Uses visibility graph + Dijkstra's algorithm.
+
+    Racks are inflated by the profile clearance. Start and end points closer
+    to a rack than that are first moved out to the clearance, the path keeps
+    that access leg.
     """
+    c = profile.clearance
+    racks = [obs.inflate(c) for obs in obstacles]
+
+    snapped_start = snap_to_clearance(start, nearest_rack_face(start, obstacles), c)
+    snapped_end = snap_to_clearance(end, nearest_rack_face(end, obstacles), c)
+    if not is_valid_waypoint(snapped_start, racks, boundary) or not is_valid_waypoint(snapped_end, racks, boundary):
+        return None
+
     # Direct line of sight - return direct path
-    if has_line_of_sight(start, end, obstacles):
-        return [start, end]
+    if has_line_of_sight(snapped_start, snapped_end, racks):
+        return add_access_legs(start, [snapped_start, snapped_end], end)
 
-    # Build waypoints from obstacle corners
+    # Build waypoints from inflated rack corners
     waypoints: list[Point] = []
     for obs in obstacles:
-        waypoints.extend(obs.get_waypoints())
+        waypoints.extend(obs.get_waypoints(c))
 
     # Filter valid waypoints
-    waypoints = [w for w in waypoints if is_valid_waypoint(w, obstacles, boundary)]
+    waypoints = [w for w in waypoints if is_valid_waypoint(w, racks, boundary)]
 
     # All nodes: start + end + waypoints
-    nodes = [start, end] + waypoints
+    nodes = [snapped_start, snapped_end] + waypoints
 
     # Build visibility graph
-    graph: dict[int, list[tuple[int, float]]] = {i: [] for i in range(len(nodes))}
-
+    sources, targets, weights = array('q'), array('q'), array('d')
     for i in range(len(nodes)):
         for j in range(i + 1, len(nodes)):
-            if has_line_of_sight(nodes[i], nodes[j], obstacles):
-                d = nodes[i].distance_to(nodes[j])
-                graph[i].append((j, d))
-                graph[j].append((i, d))
-
-    # Dijkstra's algorithm
-    dist: dict[int, float] = {i: float('inf') for i in range(len(nodes))}
-    prev: dict[int, Optional[int]] = {i: None for i in range(len(nodes))}
-    dist[0] = 0.0
-
-    pq: list[tuple[float, int]] = [(0.0, 0)]
+            if has_line_of_sight(nodes[i], nodes[j], racks):
+                sources.append(i)
+                targets.append(j)
+                weights.append(nodes[i].distance_to(nodes[j]))
 
-    while pq:
-        d, u = heappop(pq)
+    graph = CSRGraph.from_edges(len(nodes), sources, targets, weights)
 
-        if d > dist[u]:
-            continue
-
-        if u == 1:  # reached end
-            break
-
-        for v, w in graph[u]:
-            if dist[u] + w < dist[v]:
-                dist[v] = dist[u] + w
-                prev[v] = u
-                heappush(pq, (dist[v], v))
-
-    # Reconstruct path
-    if dist[1] == float('inf'):
+    # Dijkstra's algorithm from start (0) to end (1)
+    dist, route = dijkstra(graph, {0: 0.0}, {1: 0.0})
+    if dist == float('inf'):
         return None
 
-    path: list[Point] = []
-    node: Optional[int] = 1
-    while node is not None:
-        path.append(nodes[node])
-        node = prev[node]
-
-    path.reverse()
-    return path
+    return add_access_legs(start, [nodes[i] for i in route], end)
 
 
 def check_point_location(
@@ -73,8 +73,8 @@ class Rectangle:
             (Point(self.min_x, self.max_y), Point(self.min_x, self.min_y)),
         ]
 
-    def get_waypoints(self, margin: float = 0.5) -> list[Point]:
-        """Get corner waypoints with offset for pathfinding."""
+    def get_waypoints(self, margin: float) -> list[Point]:
+        """Get corner waypoints offset by margin, the corners of the inflated rectangle."""
         return [
             Point(self.min_x - margin, self.min_y - margin),
             Point(self.max_x + margin, self.min_y - margin),
@@ -82,6 +82,10 @@ class Rectangle:
             Point(self.min_x - margin, self.max_y + margin),
         ]
 
+    def inflate(self, margin: float) -> 'Rectangle':
+        """Rectangle grown by margin on every side."""
+        return Rectangle(corners=self.get_waypoints(margin), label=self.label)
+
     @classmethod
     def from_dict(cls, data: dict) -> 'Rectangle':
         corners = [Point.from_dict(c) for c in data.get("corners", [])]
@@ -0,0 +1,187 @@
+"""Routing engine sharing one precomputation across clearance profiles."""
+
+import math
+from array import array
+from typing import Iterable, Optional
+
+from .point import Point
+from .rectangle import Rectangle
+from .clearance import ClearanceProfile, DEFAULT_PROFILE
+from .graph import CSRGraph, dijkstra
+from .pathfinding import (
+    RackFace, has_line_of_sight, is_valid_waypoint, nearest_rack_face, snap_to_clearance, add_access_legs
+)
+
+
+class ObstacleIndex:
+    """Uniform grid over obstacle bounding boxes for segment queries."""
+
+    def __init__(self, obstacles: list[Rectangle], boundary: Rectangle, cell_size: Optional[float] = None):
+        self.obstacles = obstacles
+        self.bounds = [obs.bounds for obs in obstacles]
+
+        self.origin_x = boundary.min_x
+        self.origin_y = boundary.min_y
+        if cell_size is None:
+            # roughly one obstacle per cell on an evenly filled map
+            area = (boundary.max_x - boundary.min_x) * (boundary.max_y - boundary.min_y)
+            cell_size = math.sqrt(area / max(len(obstacles), 1)) or 1.0
+        self.cell_size = cell_size
+
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        for idx, (min_x, max_x, min_y, max_y) in enumerate(self.bounds):
+            for key in self._cells_for(min_x, max_x, min_y, max_y):
+                self.cells.setdefault(key, []).append(idx)
+
+    def _cells_for(self, min_x: float, max_x: float, min_y: float, max_y: float) -> Iterable[tuple[int, int]]:
+        cx0 = math.floor((min_x - self.origin_x) / self.cell_size)
+        cx1 = math.floor((max_x - self.origin_x) / self.cell_size)
+        cy0 = math.floor((min_y - self.origin_y) / self.cell_size)
+        cy1 = math.floor((max_y - self.origin_y) / self.cell_size)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def candidates(self, p1: Point, p2: Point, grow: float = 0.0) -> list[int]:
+        """Indices of obstacles whose bounding box, grown by `grow`, overlaps that of segment p1-p2."""
+        min_x, max_x = min(p1.x, p2.x) - grow, max(p1.x, p2.x) + grow
+        min_y, max_y = min(p1.y, p2.y) - grow, max(p1.y, p2.y) + grow
+
+        seen: set[int] = set()
+        for key in self._cells_for(min_x, max_x, min_y, max_y):
+            seen.update(self.cells.get(key, ()))
+
+        result = []
+        for idx in sorted(seen):
+            b_min_x, b_max_x, b_min_y, b_max_y = self.bounds[idx]
+            if b_min_x <= max_x and min_x <= b_max_x and b_min_y <= max_y and min_y <= b_max_y:
+                result.append(idx)
+        return result
+
+
+class _ProfileGraph:
+    """Inflated racks, waypoints and waypoint-to-waypoint visibility for one clearance profile."""
+
+    def __init__(self, profile: ClearanceProfile, racks: list[Rectangle]):
+        self.profile = profile
+        self.racks = racks
+        self.waypoints: list[Point] = []
+        self.graph: Optional[CSRGraph] = None
+
+
+class RoutingEngine:
+    """
+    Visibility graph router for a fixed layout and a set of clearance profiles.
+
+    The obstacle index, the rack corner candidates and the rack face each
+    pick point snaps out of do not depend on the clearance, so they are
+    built once and shared. Each profile inflates the racks by its clearance
+    and gets its own waypoint set and visibility graph, built up front;
+    queries snap start and end out of the inflated racks, attach them to
+    that graph (cached per point) and run Dijkstra.
+    """
+
+    def __init__(
+        self,
+        obstacles: list[Rectangle],
+        boundary: Rectangle,
+        profiles: Optional[list[ClearanceProfile]] = None
+    ):
+        self.obstacles = obstacles
+        self.boundary = boundary
+        self.index = ObstacleIndex(obstacles, boundary)
+
+        self._faces: dict[tuple[float, float], Optional[RackFace]] = {}
+        self._attachments: dict[tuple[str, float, float], dict[int, float]] = {}
+
+        self.profiles: dict[str, ClearanceProfile] = {}
+        self.graphs: dict[str, _ProfileGraph] = {}
+        for profile in profiles or [DEFAULT_PROFILE]:
+            if profile.name in self.profiles:
+                raise ValueError(f"Duplicate clearance profile: {profile.name}")
+            self.profiles[profile.name] = profile
+            self.graphs[profile.name] = self._build_graph(profile)
+
+    @property
+    def profile_names(self) -> list[str]:
+        return list(self.profiles)
+
+    def _build_graph(self, profile: ClearanceProfile) -> _ProfileGraph:
+        c = profile.clearance
+        racks = [obs.inflate(c) for obs in self.obstacles]
+        graph = _ProfileGraph(profile, racks)
+
+        waypoints: list[Point] = []
+        for obs in self.obstacles:
+            waypoints.extend(w for w in obs.get_waypoints(c) if self._is_free(w, graph))
+
+        sources, targets, weights = array('q'), array('q'), array('d')
+        for i in range(len(waypoints)):
+            for j in range(i + 1, len(waypoints)):
+                if self._line_of_sight(waypoints[i], waypoints[j], graph):
+                    sources.append(i)
+                    targets.append(j)
+                    weights.append(waypoints[i].distance_to(waypoints[j]))
+
+        graph.waypoints = waypoints
+        graph.graph = CSRGraph.from_edges(len(waypoints), sources, targets, weights)
+        return graph
+
+    def _line_of_sight(self, p1: Point, p2: Point, graph: _ProfileGraph) -> bool:
+        """Line of sight past the racks inflated by the profile clearance."""
+        idx = self.index.candidates(p1, p2, graph.profile.clearance)
+        return has_line_of_sight(p1, p2, [graph.racks[i] for i in idx])
+
+    def _is_free(self, p: Point, graph: _ProfileGraph) -> bool:
+        idx = self.index.candidates(p, p, graph.profile.clearance)
+        return is_valid_waypoint(p, [graph.racks[i] for i in idx], self.boundary)
+
+    def _snap(self, p: Point, graph: _ProfileGraph) -> Optional[Point]:
+        """p moved out to the profile clearance, None when that spot is blocked too."""
+        key = (p.x, p.y)
+        if key not in self._faces:
+            self._faces[key] = nearest_rack_face(p, self.obstacles)
+        snapped = snap_to_clearance(p, self._faces[key], graph.profile.clearance)
+        return snapped if self._is_free(snapped, graph) else None
+
+    def _graph_for(self, profile: str) -> _ProfileGraph:
+        try:
+            return self.graphs[profile]
+        except KeyError:
+            raise ValueError(f"Unknown clearance profile: {profile}") from None
+
+    def _attach(self, p: Point, graph: _ProfileGraph) -> dict[int, float]:
+        """Waypoints visible from p with their distances, cached per point and profile."""
+        key = (graph.profile.name, p.x, p.y)
+        edges = self._attachments.get(key)
+        if edges is None:
+            edges = {
+                i: p.distance_to(w) for i, w in enumerate(graph.waypoints)
+                if self._line_of_sight(p, w, graph)
+            }
+            self._attachments[key] = edges
+        return edges
+
+    def shortest_path(self, start: Point, end: Point, profile: str = DEFAULT_PROFILE.name) -> Optional[list[Point]]:
+        """Shortest path from start to end for the named clearance profile."""
+        graph = self._graph_for(profile)
+
+        snapped_start, snapped_end = self._snap(start, graph), self._snap(end, graph)
+        if snapped_start is None or snapped_end is None:
+            return None
+
+        if self._line_of_sight(snapped_start, snapped_end, graph):
+            return add_access_legs(start, [snapped_start, snapped_end], end)
+
+        # start and end are virtual nodes attached to the shared waypoint graph
+        dist, route = dijkstra(graph.graph, self._attach(snapped_start, graph), self._attach(snapped_end, graph))
+        if dist == math.inf:
+            return None
+
+        waypoints = [graph.waypoints[i] for i in route]
+        return add_access_legs(start, [snapped_start] + waypoints + [snapped_end], end)
+
+
+def path_distance(path: Optional[list[Point]]) -> float:
+    """Total length of a path, -1.0 when there is no path."""
+    return sum(path[k].distance_to(path[k + 1]) for k in range(len(path) - 1)) if path else -1.0
@@ -9,9 +9,11 @@ from pathlib import Path
 
 from src.point import Point
 from src.rectangle import Rectangle
-from src.pathfinding import find_shortest_path
-from config import CANVAS_WIDTH, CANVAS_HEIGHT, PADDING, POINT_RADIUS, WAYPOINT_RADIUS, POINT_COLOUR, NICE_COLOURS
-from exporter import calculate_all_paths, export_paths
+from src.clearance import ClearanceProfile
+from src.routing import RoutingEngine, path_distance
+from config import CANVAS_WIDTH, CANVAS_HEIGHT, PADDING, POINT_RADIUS, WAYPOINT_RADIUS, POINT_COLOUR, NICE_COLOURS, CLEARANCE_PROFILES, DISTANCE_DB
+from exporter import calculate_profile_paths, export_profile_paths
+from src.distance_db import area_from_filename
 
 
 class CoordinateVisualizer:
@@ -51,6 +53,15 @@ class CoordinateVisualizer:
         self.to_dropdown.pack(side=tk.LEFT, padx=5)
         self.to_dropdown.bind("<<ComboboxSelected>>", self.on_path_change)
 
+        self.profiles = [ClearanceProfile.from_dict(p) for p in CLEARANCE_PROFILES]
+        tk.Label(control_frame, text="Profile:").pack(side=tk.LEFT, padx=5)
+        self.profile_var = tk.StringVar()
+        self.profile_dropdown = ttk.Combobox(control_frame, textvariable=self.profile_var, state="readonly", width=12)
+        self.profile_dropdown['values'] = [p.name for p in self.profiles]
+        self.profile_dropdown.current(0)
+        self.profile_dropdown.pack(side=tk.LEFT, padx=5)
+        self.profile_dropdown.bind("<<ComboboxSelected>>", self.on_path_change)
+
         self.path_label = tk.Label(control_frame, text="")
         self.path_label.pack(side=tk.LEFT, padx=20)
 
@@ -70,9 +81,11 @@ class CoordinateVisualizer:
         self.status.pack(pady=5)
 
         self.data = None
+        self.area: Optional[str] = None
         self.boundary: Optional[Rectangle] = None
         self.obstacles: list[Rectangle] = []
         self.points: list[Point] = []
+        self.engine: Optional[RoutingEngine] = None
         self.current_path: Optional[list[Point]] = None
 
         self.view_min_x = 0.0
@@ -93,6 +106,7 @@ class CoordinateVisualizer:
         try:
             with open(filepath, 'r') as f:
                 self.data = json.load(f)
+            self.area = area_from_filename(filepath)
             self.parse_et_draw()
             self.status.config(text=f"Loaded: {filepath}")
         except FileNotFoundError:
@@ -127,6 +141,9 @@ class CoordinateVisualizer:
                 messagebox.showerror("Error", f"Square {i}: {e}")
                 return
 
+        # shared routing precomputation for all clearance profiles
+        self.engine = RoutingEngine(self.obstacles, self.boundary, self.profiles)
+
         # pick points
         self.points = [Point.from_dict(p) for p in self.data.get("points", [])]
         point_labels = [p.label or f"({p.x}, {p.y})" for p in self.points]
@@ -257,7 +274,7 @@ class CoordinateVisualizer:
         from_idx = self.from_dropdown.current()
         to_idx = self.to_dropdown.current()
 
-        if from_idx < 0 or to_idx < 0 or not self.points:
+        if from_idx < 0 or to_idx < 0 or not self.points or self.engine is None:
             return
 
         start = self.points[from_idx]
@@ -265,7 +282,7 @@ class CoordinateVisualizer:
 
         # Async pathfinding
         future = self.executor.submit(
-            find_shortest_path, start, end, self.obstacles, self.boundary
+            self.engine.shortest_path, start, end, self.profile_var.get()
         )
         self.root.after(10, lambda: self.check_path_result(future))
 
@@ -275,10 +292,7 @@ class CoordinateVisualizer:
             try:
                 self.current_path = future.result()
                 if self.current_path:
-                    total_dist = sum(
-                        self.current_path[i].distance_to(self.current_path[i + 1])
-                        for i in range(len(self.current_path) - 1)
-                    )
+                    total_dist = path_distance(self.current_path)
                     self.path_label.config(text=f"Path length: {total_dist:.2f}")
                 else:
                     self.path_label.config(text="No valid path found")
@@ -289,7 +303,7 @@ class CoordinateVisualizer:
             self.root.after(10, lambda: self.check_path_result(future))
 
     def export_all_paths(self):
-        """Export all point-to-point path calculations to .txt and .pkl files."""
+        """Export all point-to-point path calculations to .txt and .pkl files, one pair per profile."""
         if not self.points:
             messagebox.showwarning("Warning", "No points loaded. Load a JSON file first.")
             return
@@ -306,12 +320,13 @@ class CoordinateVisualizer:
         self.root.update()
 
         try:
-            results = calculate_all_paths(
-                self.points, self.obstacles, self.boundary, self.executor, on_progress
+            results = calculate_profile_paths(self.points, self.engine, self.executor, on_progress)
+            exported = export_profile_paths(
+                results, self.points, Path(__file__).parent / "reports", self.area, DISTANCE_DB
             )
-            txt_path, pkl_path = export_paths(results, self.points, Path(__file__).parent / "reports")
-            self.status.config(text=f"Exported to: {txt_path.name}, {pkl_path.name}")
-            messagebox.showinfo("Success", f"Paths exported to:\n{txt_path}\n{pkl_path}")
+            files = [path for paths in exported.values() for path in paths]
+            self.status.config(text=f"Exported to: {', '.join(f.name for f in files)}")
+            messagebox.showinfo("Success", "Paths exported to:\n" + "\n".join(str(f) for f in files))
         except Exception as e:
             self.status.config(text=f"Export failed: {e}")
             messagebox.showerror("Error", f"Failed to export: {e}")